@@ -1,116 +1,261 @@
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import dash
 from dash import dcc, html
+from flask import Flask
+from flask_caching import Cache
+
+
+cache = Cache(config={
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': '.cache',
+    'CACHE_DEFAULT_TIMEOUT': 3600
+})
+
+# Bump whenever load_data changes the columns or dtypes it produces, so
+# snapshots written by older code are ignored rather than reused
+# (2: email_code column)
+SNAPSHOT_VERSION = 2
 
 
 def load_data(path: str) -> pd.DataFrame:
     """
     Load and prepare the dataset.
 
+    A parquet snapshot (tagged with SNAPSHOT_VERSION) is written next to the
+    CSV on first load and reused as long as it is not older than the CSV.
+
     Args:
         path: Path to the CSV file.
 
     Returns:
         DataFrame with computed columns.
+
+    Raises:
+        ValueError: If a `qty` value is blank (quantities are read as int32).
     """
-    df = pd.read_csv(path)
+    snapshot = Path(path).with_suffix(f'.v{SNAPSHOT_VERSION}.parquet')
+    if snapshot.exists() and snapshot.stat().st_mtime >= os.path.getmtime(path):
+        # An unreadable snapshot (e.g. truncated) is rebuilt from the CSV below
+        try:
+            return pd.read_parquet(snapshot)
+        except Exception:
+            pass
+
+    df = pd.read_csv(
+        path,
+        dtype={
+            'qty': 'int32',
+            'amount': 'float32',
+            'product_id': 'category',
+            'city': 'category',
+            'job': 'category',
+            'email': 'category'
+        },
+        parse_dates=False
+    )
 
     # Date conversion
     df['invoice_date'] = pd.to_datetime(df['invoice_date'], format='%d/%m/%Y', errors='coerce')
 
-    # Revenue calculation
-    df['total_revenue'] = df['qty'] * df['amount']
+    # Revenue calculation (float32 is plenty for line totals)
+    df['total_revenue'] = df['qty'].astype(np.float32) * df['amount']
+
+    # Integer customer key so distinct counts take the numeric nunique path
+    df['email_code'] = df['email'].cat.codes.astype(np.int32)
+
+    # Best effort: a read-only data directory just means no snapshot. Written
+    # to a per-process temp file first so readers never see a partial file.
+    tmp = snapshot.with_name(f'{snapshot.name}.{os.getpid()}.tmp')
+    try:
+        df.to_parquet(tmp, compression='zstd')
+        os.replace(tmp, snapshot)
+    except OSError:
+        tmp.unlink(missing_ok=True)
 
     return df
 
 
 
+def _product_agg(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-product totals shared by the BCG and ABC analyses.
+
+    Args:
+        df: Input invoices DataFrame.
+
+    Returns:
+        DataFrame indexed by product_id with revenue, volume and customer count.
+    """
+    return df.groupby('product_id', observed=True, sort=False).agg({
+        'total_revenue': 'sum',
+        'qty': 'sum',
+        'email_code': 'nunique'
+    }).rename(columns={'email_code': 'nb_customers'})
+
+
+
+def _is_product_agg(df: pd.DataFrame) -> bool:
+    """
+    Whether `df` is a `_product_agg` result rather than raw invoices.
+
+    Checked on the aggregate-only `nb_customers` column, not on the index,
+    so a raw frame indexed by product_id is still aggregated.
+    """
+    return 'nb_customers' in df.columns
+
+
+
 def analyze_bcg_matrix(df: pd.DataFrame, top_pct: float = 0.2) -> pd.DataFrame:
     """
     Build a BCG-style product matrix with a top X% threshold (Pareto-like).
 
     Args:
-        df: Input invoices DataFrame.
+        df: Input invoices DataFrame, or its per-product aggregate from `_product_agg`.
         top_pct: Proportion of products considered as "top" for volume/revenue thresholds.
 
     Returns:
         DataFrame with BCG category and market share per product.
     """
-    analysis = df.groupby('product_id').agg({
-        'total_revenue': 'sum',
-        'qty': 'sum',
-        'email': 'nunique'
-    }).rename(columns={'email': 'nb_customers'})
+    if _is_product_agg(df):
+        analysis = df.copy()
+    else:
+        analysis = _product_agg(df)
 
     # Top X% thresholds
     revenue_threshold = analysis['total_revenue'].quantile(1 - top_pct)
     volume_threshold = analysis['qty'].quantile(1 - top_pct)
 
-    def classify(row):
-        high_rev = row['total_revenue'] > revenue_threshold
-        high_vol = row['qty'] > volume_threshold
-
-        if high_rev and high_vol:
-            return 'Star'
-        elif high_rev:
-            return 'Premium'
-        elif high_vol:
-            return 'Volume'
-        else:
-            return 'Standard'
+    high_rev = analysis['total_revenue'].values > revenue_threshold
+    high_vol = analysis['qty'].values > volume_threshold
 
-    analysis['category'] = analysis.apply(classify, axis=1)
+    analysis['category'] = pd.Categorical.from_codes(
+        np.select([high_rev & high_vol, high_rev, high_vol], [0, 1, 2], default=3),
+        categories=['Star', 'Premium', 'Volume', 'Standard']
+    )
     analysis['market_share'] = (analysis['total_revenue'] / analysis['total_revenue'].sum()) * 100
 
-    return analysis.reset_index()
+    analysis = analysis.reset_index()
+
+    # Kept for viz_bcg so the plotted lines match the classification
+    analysis.attrs['top_pct'] = top_pct
+    analysis.attrs['revenue_threshold'] = revenue_threshold
+    analysis.attrs['volume_threshold'] = volume_threshold
+
+    return analysis
+
 
 
+BCG_COLORS = {
+    'Star': '#2ecc71',
+    'Premium': '#3498db',
+    'Volume': '#f39c12',
+    'Standard': '#95a5a6'
+}
+
 
 def viz_bcg(bcg: pd.DataFrame) -> go.Figure:
     """
     Scatter plot for the BCG product matrix.
     """
-    fig = px.scatter(
-        bcg,
-        x='qty',
-        y='total_revenue',
-        color='category',
-        size='nb_customers',
-        hover_data=['product_id', 'market_share'],
-        color_discrete_map={
-            'Star':'#2ecc71',
-            'Premium': '#3498db',
-            'Volume': '#f39c12',
-            'Standard': '#95a5a6'
-        },
+    # Column arrays extracted once, then sliced per category
+    qty = bcg['qty'].to_numpy(copy=False)
+    revenue = bcg['total_revenue'].to_numpy(copy=False)
+    customers = bcg['nb_customers'].to_numpy(copy=False)
+    share = bcg['market_share'].to_numpy(copy=False)
+    product_ids = bcg['product_id'].astype(str).to_numpy(copy=False)
+    codes = bcg['category'].cat.codes.to_numpy(copy=False)
+
+    # Bubble area proportional to customer count, largest bubble 20px wide
+    sizeref = 2.0 * customers.max() / (20 ** 2)
+
+    traces = []
+
+    for code, category in enumerate(bcg['category'].cat.categories):
+        mask = codes == code
+
+        traces.append(go.Scattergl(
+            x=qty[mask],
+            y=revenue[mask],
+            mode='markers',
+            marker=dict(
+                size=customers[mask],
+                sizemode='area',
+                sizeref=sizeref,
+                color=BCG_COLORS[category]
+            ),
+            text=product_ids[mask],
+            customdata=share[mask],
+            hovertemplate=(
+                'product_id=%{text}<br>'
+                'Sales volume (units)=%{x}<br>'
+                'Total revenue ($)=%{y}<br>'
+                'market_share=%{customdata:.2f}%'
+            ),
+            name=category
+        ))
+
+    # Threshold lines (same thresholds as analyze_bcg_matrix)
+    top_label = f"Top {bcg.attrs['top_pct']:.0%}"
+    volume_threshold = bcg.attrs['volume_threshold']
+    revenue_threshold = bcg.attrs['revenue_threshold']
+    line = dict(dash='dash', color='gray')
+
+    layout = dict(
         title='Strategic Product Matrix (BCG)',
-        labels={'qty': 'Sales volume (units)', 'total_revenue': 'Total revenue ($)'}
+        xaxis=dict(title='Sales volume (units)'),
+        yaxis=dict(title='Total revenue ($)'),
+        legend=dict(title=dict(text='category')),
+        shapes=[
+            dict(type='line', xref='x', yref='paper',
+                 x0=volume_threshold, x1=volume_threshold, y0=0, y1=1, line=line),
+            dict(type='line', xref='paper', yref='y',
+                 x0=0, x1=1, y0=revenue_threshold, y1=revenue_threshold, line=line)
+        ],
+        annotations=[
+            dict(xref='x', yref='paper', x=volume_threshold, y=1,
+                 xanchor='left', yanchor='top', showarrow=False,
+                 text=f'{top_label} volume'),
+            dict(xref='paper', yref='y', x=1, y=revenue_threshold,
+                 xanchor='right', yanchor='bottom', showarrow=False,
+                 text=f'{top_label} revenue')
+        ],
+        template='plotly_white',
+        height=500
     )
 
-    # Threshold lines (approximate top 20% on this aggregated table)
-    volume_threshold = bcg['qty'].quantile(0.8)
-    revenue_threshold = bcg['total_revenue'].quantile(0.8)
+    return go.Figure(dict(data=traces, layout=layout))
 
-    fig.add_vline(
-        x=volume_threshold,
-        line_dash='dash',
-        line_color='gray',
-        annotation_text='Top 20% volume'
-    )
-    fig.add_hline(
-        y=revenue_threshold,
-        line_dash='dash',
-        line_color='gray',
-        annotation_text='Top 20% revenue'
-    )
 
-    fig.update_layout(template='plotly_white', height=500)
+def _abc_kernel(rev_sorted: np.ndarray) -> tuple:
+    """
+    Contribution, cumulative contribution, class code and rank in one sweep.
 
-    return fig
+    Args:
+        rev_sorted: Product revenues sorted in decreasing order.
+
+    Returns:
+        Tuple (contrib_pct, contrib_cumul, class codes, rank).
+    """
+    scale = 100.0 / rev_sorted.sum()
+
+    pct = rev_sorted * scale
+    cumul = np.cumsum(rev_sorted) * scale
+
+    # 0 up to 80%, 1 up to 95%, 2 beyond (bounds inclusive)
+    klass = np.searchsorted([80.0, 95.0], cumul, side='left').astype(np.int8)
+    ranks = np.arange(1, rev_sorted.size + 1, dtype=np.int32)
+
+    return pct, cumul, klass, ranks
 
 
 def analyze_abc(df: pd.DataFrame) -> pd.DataFrame:
@@ -118,32 +263,32 @@ def analyze_abc(df: pd.DataFrame) -> pd.DataFrame:
     ABC analysis by product based on total revenue.
 
     Args:
-        df: Input invoices DataFrame.
+        df: Input invoices DataFrame, or its per-product aggregate from `_product_agg`.
 
     Returns:
         DataFrame with ABC class and rank per product.
     """
-    products = (
-        df.groupby('product_id')
-        .agg({'total_revenue': 'sum'})
-        .sort_values('total_revenue', ascending=False)
-    )
-
-    products['contrib_pct'] = (products['total_revenue'] / products['total_revenue'].sum()) * 100
-    products['contrib_cumul'] = products['contrib_pct'].cumsum()
-
-    def abc_class(cumulative_pct):
-        if cumulative_pct <= 80:
-            return 'A (80% revenue)'
-        elif cumulative_pct <= 95:
-            return 'B (15% revenue)'
-        else:
-            return 'C (5% revenue)'
-
-    products['class'] = products['contrib_cumul'].apply(abc_class)
-
-    products = products.reset_index()
-    products['rank'] = range(1, len(products) + 1)
+    if not _is_product_agg(df):
+        df = _product_agg(df)
+
+    # Sort once on the raw revenue array (stable, decreasing)
+    rev = df['total_revenue'].to_numpy()
+    order = np.argsort(-rev, kind='stable')
+    sorted_rev = rev[order]
+
+    pct, cumul, klass, ranks = _abc_kernel(sorted_rev.astype(np.float64))
+
+    products = pd.DataFrame({
+        'product_id': df.index[order],
+        'total_revenue': sorted_rev,
+        'contrib_pct': pct,
+        'contrib_cumul': cumul,
+        'class': pd.Categorical.from_codes(
+            klass,
+            categories=['A (80% revenue)', 'B (15% revenue)', 'C (5% revenue)']
+        ),
+        'rank': ranks
+    })
 
     return products
 
@@ -159,13 +304,13 @@ def analyze_geography(df: pd.DataFrame, top_n: int = 15) -> pd.DataFrame:
     Returns:
         DataFrame with geographic metrics per city.
     """
-    geo = df.groupby('city').agg({
+    geo = df.groupby('city', observed=True, sort=False).agg({
         'total_revenue': 'sum',
-        'email': 'nunique',
+        'email_code': 'nunique',
         'product_id': 'count'
     }).rename(columns={
         'total_revenue': 'total_revenue_city',
-        'email': 'nb_customers',
+        'email_code': 'nb_customers',
         'product_id': 'nb_transactions'
     })
 
@@ -173,11 +318,15 @@ def analyze_geography(df: pd.DataFrame, top_n: int = 15) -> pd.DataFrame:
     geo['revenue_per_customer'] = geo['total_revenue_city'] / geo['nb_customers']
 
     # Composite potential score (normalized)
+    tr = geo['total_revenue_city'].to_numpy(dtype=np.float64)
+    ab = geo['avg_basket'].to_numpy(dtype=np.float64)
+    nc = geo['nb_customers'].to_numpy(dtype=np.float64)
+
     geo['score'] = (
-        (geo['total_revenue_city'] / geo['total_revenue_city'].max()) * 0.4 +
-        (geo['avg_basket'] / geo['avg_basket'].max()) * 0.3 +
-        (geo['nb_customers'] / geo['nb_customers'].max()) * 0.3
-    ) * 10
+        tr * (0.4 * 10.0 / tr.max()) +
+        ab * (0.3 * 10.0 / ab.max()) +
+        nc * (0.3 * 10.0 / nc.max())
+    )
 
     return geo.nlargest(top_n, 'total_revenue_city').reset_index()
 
@@ -186,27 +335,42 @@ def viz_geo(geo: pd.DataFrame) -> go.Figure:
     """
     Geographic bubble chart for top cities.
     """
-    fig = px.scatter(
-        geo,
-        x='avg_basket',
-        y='total_revenue_city',
-        size='nb_customers',
-        color='score',
-        hover_data=['city'],
-        text='city',
-        color_continuous_scale='Viridis',
+    customers = geo['nb_customers'].to_numpy(copy=False)
+
+    traces = [go.Scattergl(
+        x=geo['avg_basket'].to_numpy(copy=False),
+        y=geo['total_revenue_city'].to_numpy(copy=False),
+        mode='markers+text',
+        text=geo['city'].astype(str).to_numpy(copy=False),
+        textposition='top center',
+        marker=dict(
+            # Bubble area proportional to customer count, largest bubble 20px wide
+            size=customers,
+            sizemode='area',
+            sizeref=2.0 * customers.max() / (20 ** 2),
+            color=geo['score'].to_numpy(copy=False),
+            colorscale='Viridis',
+            colorbar=dict(title=dict(text='Potential score'))
+        ),
+        hovertemplate=(
+            'city=%{text}<br>'
+            'Average basket ($)=%{x}<br>'
+            'Total revenue ($)=%{y}<br>'
+            'nb_customers=%{marker.size}<br>'
+            'Potential score=%{marker.color}'
+            '<extra></extra>'
+        )
+    )]
+
+    layout = dict(
         title='Geographic Performance (Top 15 Cities)',
-        labels={
-            'avg_basket': 'Average basket ($)',
-            'total_revenue_city': 'Total revenue ($)',
-            'score': 'Potential score'
-        }
+        xaxis=dict(title='Average basket ($)'),
+        yaxis=dict(title='Total revenue ($)'),
+        template='plotly_white',
+        height=500
     )
 
-    fig.update_traces(textposition='top center')
-    fig.update_layout(template='plotly_white', height=500)
-
-    return fig
+    return go.Figure(dict(data=traces, layout=layout))
 
 
 
@@ -221,41 +385,58 @@ def analyze_profiles(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
     Returns:
         DataFrame with metrics per profession.
     """
-    profiles = df.groupby('job').agg({
-        'total_revenue': ['sum', 'mean'],
-        'email': 'nunique'
+    gb = df.groupby('job', observed=True, sort=False)
+    sums = gb['total_revenue'].sum()
+    means = gb['total_revenue'].mean()
+    customers = gb['email_code'].nunique()
+
+    # Stable sort so ties keep group order, like nlargest(keep='first')
+    values = sums.to_numpy()
+    top_idx = np.argsort(-values, kind='stable')[:max(top_n, 0)]
+
+    return pd.DataFrame({
+        'job': sums.index[top_idx],
+        'total_revenue': values[top_idx],
+        'avg_spend': means.to_numpy()[top_idx],
+        'nb_customers': customers.to_numpy()[top_idx]
     })
 
-    profiles.columns = ['total_revenue', 'avg_spend', 'nb_customers']
-    profiles = profiles.nlargest(top_n, 'total_revenue').reset_index()
-
-    return profiles
-
 
 def viz_profiles(profiles: pd.DataFrame) -> go.Figure:
     """
     Horizontal bar chart for professions.
     """
-    fig = px.bar(
-        profiles,
-        y='job',
-        x='total_revenue',
+    total_revenue = profiles['total_revenue'].to_numpy(copy=False)
+
+    traces = [go.Bar(
+        y=profiles['job'].astype(str).to_numpy(copy=False),
+        x=total_revenue,
         orientation='h',
-        color='avg_spend',
-        color_continuous_scale='Blues',
+        marker=dict(
+            color=profiles['avg_spend'].to_numpy(copy=False),
+            colorscale='Blues',
+            colorbar=dict(title=dict(text='Average spend ($)'))
+        ),
+        text=total_revenue,
+        texttemplate='$%{text:,.0f}',
+        textposition='outside',
+        hovertemplate=(
+            'Profession=%{y}<br>'
+            'Total revenue ($)=%{x}<br>'
+            'Average spend ($)=%{marker.color}'
+            '<extra></extra>'
+        )
+    )]
+
+    layout = dict(
         title='Top 10 Professions by Revenue',
-        labels={
-            'total_revenue': 'Total revenue ($)',
-            'job': 'Profession',
-            'avg_spend': 'Average spend ($)'
-        },
-        text='total_revenue'
+        xaxis=dict(title='Total revenue ($)'),
+        yaxis=dict(title='Profession'),
+        template='plotly_white',
+        height=500
     )
 
-    fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
-    fig.update_layout(template='plotly_white', height=500)
-
-    return fig
+    return go.Figure(dict(data=traces, layout=layout))
 
 
 
@@ -266,8 +447,8 @@ def viz_abc(abc: pd.DataFrame) -> go.Figure:
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-        x=abc['rank'],
-        y=abc['contrib_cumul'],
+        x=abc['rank'].to_numpy(copy=False),
+        y=abc['contrib_cumul'].to_numpy(copy=False),
         mode='lines+markers',
         name='Cumulative revenue (%)'
     ))
@@ -308,25 +489,29 @@ def analyze_distribution(df: pd.DataFrame) -> dict:
         df: Input invoices DataFrame.
 
     Returns:
-        Dict with descriptive stats and normalized data.
+        Dict with descriptive stats and the order amounts.
     """
+    arr = df['total_revenue'].to_numpy(dtype=np.float64, copy=False)
+    # Skip missing amounts, as the pandas reductions did
+    arr = arr[np.isfinite(arr)]
+    n = arr.size
+
+    # Single pass for the moments, single call for the order statistics
+    mean = arr.sum() / n
+    std = math.sqrt(max((arr * arr).sum() / n - mean * mean, 0.0) * n / (n - 1))
+    q25, q50, q75 = np.quantile(arr, [0.25, 0.5, 0.75])
+
     stats = {
-        'mean': df['total_revenue'].mean(),
-        'median': df['total_revenue'].median(),
-        'std': df['total_revenue'].std(),
-        'min': df['total_revenue'].min(),
-        'max': df['total_revenue'].max(),
-        'q25': df['total_revenue'].quantile(0.25),
-        'q75': df['total_revenue'].quantile(0.75)
+        'mean': mean,
+        'median': q50,
+        'std': std,
+        'min': arr.min(),
+        'max': arr.max(),
+        'q25': q25,
+        'q75': q75
     }
 
-    # Min–Max normalization
-    df_norm = df.copy()
-    df_norm['revenue_norm'] = (
-        (df['total_revenue'] - stats['min']) / (stats['max'] - stats['min'])
-    )
-
-    return {'stats': stats, 'data': df_norm}
+    return {'stats': stats, 'data': df[['total_revenue']]}
 
 
 
@@ -340,20 +525,36 @@ def viz_distribution(result: dict) -> go.Figure:
         column_widths=[0.7, 0.3]
     )
 
-    # Histogram
+    arr = result['data']['total_revenue'].to_numpy(copy=False)
+    # Missing amounts are left out, as go.Histogram/go.Box did client-side
+    arr = arr[np.isfinite(arr)]
+    stats = result['stats']
+
+    # Histogram (binned here so only the 50 counts are sent to the browser)
+    counts, edges = np.histogram(arr, bins=50)
+
     fig.add_trace(
-        go.Histogram(
-            x=result['data']['total_revenue'],
-            nbinsx=50,
+        go.Bar(
+            x=0.5 * (edges[:-1] + edges[1:]),
+            y=counts,
+            width=edges[1] - edges[0],
             name='Frequency'
         ),
         row=1, col=1
     )
 
-    # Box plot
+    # Box plot (Tukey fences: furthest points within 1.5 IQR of the quartiles)
+    iqr = stats['q75'] - stats['q25']
+    lower_fence = arr[arr >= stats['q25'] - 1.5 * iqr].min()
+    upper_fence = arr[arr <= stats['q75'] + 1.5 * iqr].max()
+
     fig.add_trace(
         go.Box(
-            y=result['data']['total_revenue'],
+            q1=[stats['q25']],
+            median=[stats['median']],
+            q3=[stats['q75']],
+            lowerfence=[lower_fence],
+            upperfence=[upper_fence],
             name='Distribution'
         ),
         row=1, col=2
@@ -374,11 +575,76 @@ def viz_distribution(result: dict) -> go.Figure:
 
 
 
-def create_dashboard(bcg, abc, geo, profiles, distrib):
+def _data_version(path: str) -> tuple:
+    """
+    Cache key for a data file: changes whenever the file is rewritten.
+    """
+    st = os.stat(path)
+    return st.st_mtime, st.st_size
+
+
+
+def _code_version() -> float:
+    """
+    Cache key for this module: changes whenever app.py is edited, so cached
+    figures never outlive the analysis or plotting code that built them.
+    """
+    return os.path.getmtime(__file__)
+
+
+
+@cache.memoize()
+def build_figures(path: str, mtime: float, size: int, code_version: float) -> dict:
+    """
+    Run the 5 analyses and serialize their figures.
+
+    Memoized on (path, mtime, size, code_version), so a given version of the
+    CSV is only analyzed and serialized once per version of this module.
+
+    Args:
+        path: Path to the CSV file.
+        mtime: Modification time of the CSV file.
+        size: Size of the CSV file in bytes.
+        code_version: Modification time of this module (see `_code_version`).
+
+    Returns:
+        Dict of Plotly figure JSON strings keyed by indicator.
+    """
+    df = load_data(path)
+    prod_agg = _product_agg(df)
+
+    # The analyses only read their inputs and spend most of their time in
+    # pandas/numpy kernels that release the GIL, so they can run side by side
+    tasks = {
+        'bcg': (analyze_bcg_matrix, prod_agg),
+        'abc': (analyze_abc, prod_agg),
+        'geo': (analyze_geography, df),
+        'profiles': (analyze_profiles, df),
+        'distrib': (analyze_distribution, df)
+    }
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {key: executor.submit(fn, data) for key, (fn, data) in tasks.items()}
+        results = {key: future.result() for key, future in futures.items()}
+
+    return {
+        'bcg': viz_bcg(results['bcg']).to_json(),
+        'abc': viz_abc(results['abc']).to_json(),
+        'geo': viz_geo(results['geo']).to_json(),
+        'profiles': viz_profiles(results['profiles']).to_json(),
+        'distrib': viz_distribution(results['distrib']).to_json()
+    }
+
+
+
+def create_dashboard(figures: dict, server=True):
     """
     Dash dashboard with 5 indicators.
+
+    Args:
+        figures: Figure JSON strings from `build_figures`.
+        server: Flask server to attach to (Dash creates one by default).
     """
-    app = dash.Dash(__name__)
+    app = dash.Dash(__name__, server=server)
 
     # Reusable style for indicator boxes
     style_box = {
@@ -410,35 +676,35 @@ def create_dashboard(bcg, abc, geo, profiles, distrib):
         html.Div([
             html.H3("Indicator 1: BCG Product Matrix", style={'color': '#2980b9'}),
             html.P("Action: Focus on Stars/Premium (top 20%), monitor Standard products."),
-            dcc.Graph(figure=viz_bcg(bcg))
+            dcc.Graph(figure=json.loads(figures['bcg']))
         ], style=style_box),
 
         # Indicator 2: ABC
         html.Div([
             html.H3("Indicator 2: ABC Analysis (Pareto)", style={'color': '#27ae60'}),
             html.P("Action: Prioritize management of Class A products (up to 80% of revenue)."),
-            dcc.Graph(figure=viz_abc(abc))
+            dcc.Graph(figure=json.loads(figures['abc']))
         ], style=style_box),
 
         # Indicator 3: Geography
         html.Div([
             html.H3("Indicator 3: Geographic Performance", style={'color': '#8e44ad'}),
             html.P("Action: Invest in cities with high potential scores."),
-            dcc.Graph(figure=viz_geo(geo))
+            dcc.Graph(figure=json.loads(figures['geo']))
         ], style=style_box),
 
         # Indicator 4: Profiles
         html.Div([
             html.H3("Indicator 4: Top Professions by Revenue", style={'color': '#d35400'}),
             html.P("Action: B2B targeting by profession and corporate partnerships."),
-            dcc.Graph(figure=viz_profiles(profiles))
+            dcc.Graph(figure=json.loads(figures['profiles']))
         ], style=style_box),
 
         # Indicator 5: Distribution
         html.Div([
             html.H3("Indicator 5: Amount Distribution", style={'color': '#c0392b'}),
             html.P("Action: Segment customers by basket size (small / medium / large)."),
-            dcc.Graph(figure=viz_distribution(distrib))
+            dcc.Graph(figure=json.loads(figures['distrib']))
         ], style=style_box)
     ], style={'backgroundColor': '#f5f6fa', 'padding': '10px'})
 
@@ -446,15 +712,41 @@ def create_dashboard(bcg, abc, geo, profiles, distrib):
 
 
 
-df = load_data('../data/invoices.csv')
+DATA_PATH = '../data/invoices.csv'
+
+
+@lru_cache(maxsize=1)
+def build_app() -> dash.Dash:
+    """
+    Build the dashboard app (data loading and analyses run on first call only).
+    """
+    server = Flask(__name__)
+    cache.init_app(server)
+
+    with server.app_context():
+        figures = build_figures(DATA_PATH, *_data_version(DATA_PATH), _code_version())
+
+    return create_dashboard(figures, server=server)
+
+
+
+def create_server() -> Flask:
+    """
+    WSGI entry point, e.g. `gunicorn 'app:create_server()'` from src/.
+    """
+    return build_app().server
 
-bcg = analyze_bcg_matrix(df)
-abc = analyze_abc(df)
-geo = analyze_geography(df)
-profiles = analyze_profiles(df)
-distrib = analyze_distribution(df)
 
-app = create_dashboard(bcg, abc, geo, profiles, distrib)
 
 if __name__ == "__main__":
-    app.run_server(debug=True, port=8051)
+    app = build_app()
+
+    # Loopback only unless DASH_HOST says otherwise (e.g. 0.0.0.0)
+    host = os.environ.get('DASH_HOST', '127.0.0.1')
+
+    if os.environ.get('DASH_DEBUG', '').lower() in ('1', 'true'):
+        # Flask development server with debugger and reloader
+        app.run(debug=True, host=host, port=8051)
+    else:
+        from waitress import serve
+        serve(app.server, host=host, port=8051, threads=8)